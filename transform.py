@@ -1,11 +1,126 @@
 # Smart RAG Document Chunker
 import os
 import re
-import glob
+import copy
+import sys
+import fnmatch
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 import hashlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+try:
+    import orjson  # Optional: C JSON encoder, much faster for large chunk dumps
+except ImportError:
+    orjson = None
+
+# Precompiled patterns used on every section / paragraph
+_RE_CODE = re.compile(r'```[\s\S]*?```')
+_RE_SENT = re.compile(r'(?<=[.!?])\s+')
+# Greedy prefix backtracks from the end, so this finds the last sentence break
+_RE_LAST_SENT = re.compile(r'[\s\S]*[.!?]\s+')
+_RE_NONWORD = re.compile(r'[^\w\s-]')
+_RE_SPACES = re.compile(r'\s+')
+
+# Whitespace normalization in one scan; the group that matched selects the replacement:
+# excessive blank lines, CRLF line endings, trailing spaces, runs of spaces/tabs
+_RE_NORM = re.compile(r'((?:\r?\n){3,})|(\r\n)|([ \t]+(?=\r?\n))|([ \t]+)')
+_NORM_REPL = (None, '\n\n', '\n', '', ' ')
+
+# Escapes field separators and newlines in one pass for the RAG line format
+_RAG_TRANS = str.maketrans({'|': '&#124;', '\n': '\\n'})
+_RAG_HEADER = "# SMART RAG-READY CHUNKS\n# Format: ID|LEVEL|SECTION|PARENT|TOKENS|HASH|CONTENT\n\n"
+
+# Large output buffer so multi-megabyte outputs need few write syscalls
+_WRITE_BUFFER = 1 << 20
+
+# Chunk levels, shared by every chunk instead of one string per chunk
+_PARENT = sys.intern('parent')
+_CHILD = sys.intern('child')
+
+@dataclass(slots=True)
+class Chunk:
+    """A parent or child chunk (slots keep per-chunk memory and attribute access cheap)"""
+    chunk_id: str
+    level: str
+    section_name: str
+    parent_id: Optional[str] = None
+    chunk_index: int = 0
+    content: str = ''
+    char_count: int = 0
+    estimated_tokens: int = 0
+    child_chunk_ids: List[str] = field(default_factory=list)
+    child_count: int = 0
+    global_id: int = 0
+    content_hash: str = ''
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the output layout, with level-specific keys only where they apply"""
+        data = {'chunk_id': self.chunk_id, 'level': self.level, 'section_name': self.section_name}
+        if self.parent_id is not None:
+            data['parent_id'] = self.parent_id
+        data['chunk_index'] = self.chunk_index
+        data['content'] = self.content
+        data['char_count'] = self.char_count
+        data['estimated_tokens'] = self.estimated_tokens
+        if self.content_hash:
+            data['content_hash'] = self.content_hash
+        if self.level == _PARENT:
+            data['child_chunk_ids'] = self.child_chunk_ids
+            data['child_count'] = self.child_count
+        data['global_id'] = self.global_id
+        return data
+
+def _hash(data: bytes) -> str:
+    """Short content fingerprint (8 hex chars) - BLAKE2b is much faster than MD5"""
+    return hashlib.blake2b(data, digest_size=4).hexdigest()
+
+def _iter_sentences(text: str):
+    """Yield the same pieces as _RE_SENT.split(text), slicing lazily from match offsets"""
+    start = 0
+    for match in _RE_SENT.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+def _last_sentence_start(text: str) -> int:
+    """Offset where the last sentence of text begins (0 if there is no sentence break)"""
+    match = _RE_LAST_SENT.match(text)
+    return match.end() if match else 0
+
+def _write_json(filename: str, data: Dict):
+    """Write pretty-printed UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(filename, 'wb', buffering=_WRITE_BUFFER) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(filename, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def _iter_reads(pool: ThreadPoolExecutor, paths: List[str], window: int) -> Iterator[Tuple[str, Future]]:
+    """Yield (path, future) in order, with at most `window` reads submitted ahead of the consumer"""
+    paths = iter(paths)
+    pending = deque((path, pool.submit(_read_text, path)) for path in islice(paths, window))
+    while pending:
+        path, read = pending.popleft()
+        for next_path in islice(paths, 1):
+            pending.append((next_path, pool.submit(_read_text, next_path)))
+        yield path, read
+
+def _read_text(file_path: str) -> str:
+    """Read a text file, stripping (and copying) only when there is surrounding whitespace"""
+    content = Path(file_path).read_text(encoding='utf-8')
+    if content[:1].isspace() or content[-1:].isspace():
+        content = content.strip()
+    return content
+
+def _process_section(chunker: 'SmartRAGChunker', section_name: str, content: str) -> Dict:
+    """Chunk a single section in a worker process, using a snapshot of the caller's chunker"""
+    return chunker._chunk_section(section_name, content)
 
 class SmartRAGChunker:
     """
@@ -17,6 +132,12 @@ class SmartRAGChunker:
         self.sections = {}
         self.hierarchical_chunks = {}
         self.all_chunks = []
+        # Per-level views of all_chunks, built once during chunking
+        self._parent_chunks = []
+        self._child_chunks = []
+        # Token averages per level, computed once after chunking
+        self._avg_parent_tokens = 0
+        self._avg_child_tokens = 0
         self.model_context_window = model_context_window
         self.source_folder = None  # Track source folder for output
         
@@ -35,6 +156,11 @@ class SmartRAGChunker:
             'min_chunk_size': 100,
             'sentence_boundary_preference': True,
             'preserve_code_blocks': True,
+            
+            # Parallelism (sections are chunked independently)
+            'max_workers': None,              # Chunking processes; None = one per CPU
+            'read_workers': None,             # File-reading threads; None = ThreadPoolExecutor default
+            'parallel_min_chars': 500_000,    # Below this, worker startup costs more than it saves
         }
         
         # Domain-specific acronyms with explanations
@@ -66,6 +192,11 @@ class SmartRAGChunker:
             'UL': 'Up Link',
             'TFT': 'Traffic Flow Template',
         }
+        
+        # Single alternation so all acronyms are found in one scan
+        # (compiled lazily and rebuilt whenever the domain_acronyms keys change)
+        self._acronym_keys = None
+        self._acronym_alt = None
 
     def load_sections(self, file_pattern: str = "*.txt", folder_path: str = "./") -> bool:
         """Load text files and prepare them for chunking"""
@@ -76,9 +207,15 @@ class SmartRAGChunker:
         # Store the source folder for output
         self.source_folder = os.path.abspath(folder_path)
         
-        # Find matching files
-        pattern = os.path.join(folder_path, file_pattern) if folder_path != "./" else file_pattern
-        txt_files = sorted(glob.glob(pattern))
+        # Find matching files (scandir reuses directory entry info, no extra stat per file)
+        try:
+            with os.scandir(folder_path) as entries:
+                txt_files = sorted(
+                    e.path for e in entries
+                    if not e.name.startswith('.') and e.is_file() and fnmatch.fnmatch(e.name, file_pattern)
+                )
+        except OSError:
+            txt_files = []
         
         if not txt_files:
             print("❌ No .txt files found!")
@@ -86,34 +223,38 @@ class SmartRAGChunker:
         
         print(f"📁 Found {len(txt_files)} files:")
         
-        # Process each file
-        for file_path in txt_files:
-            section_name = self._clean_section_name(os.path.splitext(os.path.basename(file_path))[0])
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                
-                # Skip files that are too short
-                if len(content) < self.config['min_chunk_size']:
-                    print(f"  ⚠️  Skipped '{section_name}': too short ({len(content)} chars)")
-                    continue
-                
-                # Clean and prepare content
-                content = self._preprocess_content(content)
-                self.sections[section_name] = content
+        # Read files concurrently (IO-bound) but process them in order, keeping only a
+        # small window of raw file contents in memory at once
+        read_workers = self.config['read_workers'] or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=read_workers) as pool:
+            # Process each file
+            for file_path, read in _iter_reads(pool, txt_files, read_workers):
+                # Interned: every chunk of the section shares this one string
+                section_name = sys.intern(self._clean_section_name(os.path.splitext(os.path.basename(file_path))[0]))
                 
-                # Show progress
-                estimated_tokens = len(content) // 4
-                print(f"  ✅ '{section_name}': {len(content)} chars (~{estimated_tokens} tokens)")
+                try:
+                    content = read.result()
                     
-            except Exception as e:
-                print(f"  ❌ Error loading '{section_name}': {e}")
+                    # Skip files that are too short
+                    if len(content) < self.config['min_chunk_size']:
+                        print(f"  ⚠️  Skipped '{section_name}': too short ({len(content)} chars)")
+                        continue
+                    
+                    # Clean and prepare content
+                    content = self._preprocess_content(content)
+                    self.sections[section_name] = content
+                    
+                    # Show progress
+                    char_count = len(content)
+                    print(f"  ✅ '{section_name}': {char_count} chars (~{char_count >> 2} tokens)")
+                        
+                except Exception as e:
+                    print(f"  ❌ Error loading '{section_name}': {e}")
         
         # Show summary
         if self.sections:
             total_chars = sum(len(content) for content in self.sections.values())
-            total_tokens = total_chars // 4
+            total_tokens = total_chars >> 2
             print(f"\n📊 Successfully loaded {len(self.sections)} sections")
             print(f"📏 Total content: {total_chars:,} chars (~{total_tokens:,} tokens)")
             
@@ -125,8 +266,8 @@ class SmartRAGChunker:
 
     def _clean_section_name(self, name: str) -> str:
         """Clean up section names to be consistent"""
-        clean_name = re.sub(r'[^\w\s-]', '', name)
-        clean_name = re.sub(r'\s+', '_', clean_name.strip())
+        clean_name = _RE_NONWORD.sub('', name)
+        clean_name = _RE_SPACES.sub('_', clean_name.strip())
         return clean_name.lower()
 
     def _preprocess_content(self, content: str) -> str:
@@ -138,13 +279,10 @@ class SmartRAGChunker:
             code_blocks.append(match.group(0))
             return f"<<CODE_BLOCK_{len(code_blocks)-1}>>"
         
-        content = re.sub(r'```[\s\S]*?```', save_code, content)
+        content = _RE_CODE.sub(save_code, content)
         
         # Clean up text formatting
-        content = re.sub(r'\r\n', '\n', content)        # Normalize line endings
-        content = re.sub(r'\n{3,}', '\n\n', content)    # Remove excessive blank lines
-        content = re.sub(r'[ \t]+', ' ', content)       # Normalize spaces
-        content = re.sub(r' \n', '\n', content)         # Remove trailing spaces
+        content = _RE_NORM.sub(lambda m: _NORM_REPL[m.lastindex], content)
         
         # Restore code blocks
         for i, code_block in enumerate(code_blocks):
@@ -157,20 +295,35 @@ class SmartRAGChunker:
 
     def _add_acronym_definitions(self, content: str) -> str:
         """Add definitions for acronyms to help with understanding"""
+        acronym_alt = self._get_acronym_pattern()
+        if acronym_alt is None:
+            return content
+        
         defined_acronyms = set()
         
-        for acronym, definition in self.domain_acronyms.items():
-            # Look for the acronym as a standalone word
-            pattern = r'\b' + re.escape(acronym) + r'\b'
-            if re.search(pattern, content) and acronym not in defined_acronyms:
-                # Replace first occurrence with acronym + definition
-                replacement = f"{acronym} ({definition})"
-                content = re.sub(pattern, replacement, content, count=1)
-                defined_acronyms.add(acronym)
+        def expand(match):
+            acronym = match.group(1)
+            definition = self.domain_acronyms.get(acronym)
+            if definition is None or acronym in defined_acronyms:
+                return acronym
+            # Expand only the first occurrence with acronym + definition
+            defined_acronyms.add(acronym)
+            return f"{acronym} ({definition})"
         
-        return content
+        return acronym_alt.sub(expand, content)
 
-    def create_hierarchical_chunks(self) -> List[Dict]:
+    def _get_acronym_pattern(self) -> Optional[re.Pattern]:
+        """Alternation of the current acronyms, recompiled only when the keys change"""
+        keys = tuple(self.domain_acronyms)
+        if keys != self._acronym_keys:
+            self._acronym_keys = keys
+            self._acronym_alt = (
+                re.compile(r'\b(' + '|'.join(re.escape(a) for a in keys) + r')\b')
+                if keys else None
+            )
+        return self._acronym_alt
+
+    def create_hierarchical_chunks(self) -> List[Chunk]:
         """Create smart hierarchical chunks optimized for RAG systems"""
         print(f"\n🏗️ Creating Smart Hierarchical Chunks")
         print(f"📏 Parent chunks: ~{self.config['parent_chunk_size']} chars (broader context)")
@@ -179,46 +332,119 @@ class SmartRAGChunker:
         
         self.hierarchical_chunks = {}
         self.all_chunks = []
-        global_id = 1
+        self._parent_chunks = []
+        self._child_chunks = []
         
-        for section_name, content in self.sections.items():
+        for section_data in self.iter_section_chunks():
+            section_name = section_data['section_name']
             print(f"\n--- Processing: {section_name} ---")
-            
-            # Create parent chunks (larger context pieces)
-            parent_chunks = self._create_parent_chunks(section_name, content)
-            print(f"  📦 Created {len(parent_chunks)} parent chunks")
-            
-            section_data = {
-                'section_name': section_name,
-                'original_length': len(content),
-                'parent_chunks': parent_chunks,
-                'child_chunks': []
-            }
-            
-            # Create child chunks from each parent (for retrieval)
-            for parent_idx, parent_chunk in enumerate(parent_chunks):
-                child_chunks = self._create_child_chunks(
-                    section_name, parent_chunk, parent_idx
-                )
-                section_data['child_chunks'].extend(child_chunks)
-                parent_chunk['child_chunk_ids'] = [c['chunk_id'] for c in child_chunks]
-                parent_chunk['child_count'] = len(child_chunks)
-            
+            print(f"  📦 Created {len(section_data['parent_chunks'])} parent chunks")
             print(f"  📄 Created {len(section_data['child_chunks'])} child chunks")
             
-            # Assign global IDs and store all chunks
-            for chunk in parent_chunks + section_data['child_chunks']:
-                chunk['global_id'] = global_id
-                self.all_chunks.append(chunk)
-                global_id += 1
+            # Store all chunks
+            self.all_chunks.extend(section_data['parent_chunks'])
+            self.all_chunks.extend(section_data['child_chunks'])
             
             self.hierarchical_chunks[section_name] = section_data
+            self._parent_chunks.extend(section_data['parent_chunks'])
+            self._child_chunks.extend(section_data['child_chunks'])
+        
+        # Token averages are shared by the metrics, metadata and recommendations
+        parent_chunks, child_chunks = self._parent_chunks, self._child_chunks
+        parent_total = sum(c.estimated_tokens for c in parent_chunks)
+        child_total = sum(c.estimated_tokens for c in child_chunks)
+        self._avg_parent_tokens = parent_total / len(parent_chunks) if parent_chunks else 0
+        self._avg_child_tokens = child_total / len(child_chunks) if child_chunks else 0
         
         # Show optimization metrics
         self._calculate_optimization_metrics()
         return self.all_chunks
 
-    def _create_parent_chunks(self, section_name: str, content: str) -> List[Dict]:
+    def iter_section_chunks(self) -> Iterator[Dict]:
+        """Yield chunked sections one at a time, with global IDs assigned in order"""
+        names = list(self.sections)
+        contents = list(self.sections.values())
+        total_chars = sum(len(content) for content in contents)
+        workers = min(self.config['max_workers'] or os.cpu_count() or 1, len(names))
+        
+        if workers > 1 and total_chars >= self.config['parallel_min_chars']:
+            # Sections are independent - chunk them across processes
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                yield from self._number_sections(
+                    self._iter_parallel_sections(pool, workers, names, contents)
+                )
+        else:
+            yield from self._number_sections(map(self._chunk_section, names, contents))
+
+    def _iter_parallel_sections(self, pool: ProcessPoolExecutor, window: int,
+                                names: List[str], contents: List[str]) -> Iterator[Dict]:
+        """Yield worker results in order, with at most `window` sections in flight at once"""
+        snapshot = self._worker_snapshot()
+        tasks = zip(names, contents)
+        pending = deque(
+            pool.submit(_process_section, snapshot, name, content)
+            for name, content in islice(tasks, window)
+        )
+        while pending:
+            section_data = pending.popleft().result()
+            # Top the window back up before handing the finished section to the consumer
+            for name, content in islice(tasks, 1):
+                pending.append(pool.submit(_process_section, snapshot, name, content))
+            yield section_data
+
+    def _worker_snapshot(self) -> 'SmartRAGChunker':
+        """Shallow copy of this chunker without the corpus or results, cheap to send to workers"""
+        snapshot = copy.copy(self)
+        snapshot.sections = {}
+        snapshot.hierarchical_chunks = {}
+        snapshot.all_chunks = []
+        snapshot._parent_chunks = []
+        snapshot._child_chunks = []
+        return snapshot
+
+    def _number_sections(self, sections: Iterable[Dict]) -> Iterator[Dict]:
+        """Assign global IDs (parents first, then children) as sections stream by"""
+        global_id = 1
+        for section_data in sections:
+            for chunk in section_data['parent_chunks'] + section_data['child_chunks']:
+                chunk.global_id = global_id
+                global_id += 1
+            yield section_data
+
+    def _chunk_section(self, section_name: str, content: str) -> Dict:
+        """Create the parent and child chunks for one section"""
+        # Create parent chunks (larger context pieces)
+        parent_chunks = self._create_parent_chunks(section_name, content)
+        
+        section_data = {
+            'section_name': section_name,
+            'original_length': len(content),
+            'parent_chunks': parent_chunks,
+            'child_chunks': []
+        }
+        
+        # Create child chunks from each parent (for retrieval)
+        for parent_idx, parent_chunk in enumerate(parent_chunks):
+            child_chunks = self._create_child_chunks(
+                section_name, parent_chunk, parent_idx
+            )
+            section_data['child_chunks'].extend(child_chunks)
+            parent_chunk.child_chunk_ids = [c.chunk_id for c in child_chunks]
+            parent_chunk.child_count = len(child_chunks)
+        
+        return section_data
+
+    def _make_chunk(self, content: str, **meta) -> Chunk:
+        """Build a chunk, measuring the content only once (hashes are added on save)"""
+        char_count = len(content)
+        return Chunk(
+            content=content,
+            char_count=char_count,
+            estimated_tokens=char_count >> 2,  # 1 token ≈ 4 characters
+            **meta
+        )
+
+    def _create_parent_chunks(self, section_name: str, content: str) -> List[Chunk]:
         """Create parent chunks with intelligent sizing"""
         parent_chunks = []
         chunk_size = self.config['parent_chunk_size']
@@ -226,150 +452,166 @@ class SmartRAGChunker:
         
         if len(content) <= chunk_size:
             # Content fits in a single parent chunk
-            chunk = {
-                'chunk_id': f"{section_name}_P1",
-                'level': 'parent',
-                'section_name': section_name,
-                'chunk_index': 1,
-                'content': content,
-                'char_count': len(content),
-                'estimated_tokens': len(content) // 4,
-                'content_hash': hashlib.md5(content.encode()).hexdigest()[:8]
-            }
-            parent_chunks.append(chunk)
+            chunks = [content]
         else:
             # Split content into multiple parent chunks
             chunks = self._smart_split_content(content, chunk_size, overlap)
-            for i, chunk_content in enumerate(chunks, 1):
-                chunk = {
-                    'chunk_id': f"{section_name}_P{i}",
-                    'level': 'parent',
-                    'section_name': section_name,
-                    'chunk_index': i,
-                    'content': chunk_content,
-                    'char_count': len(chunk_content),
-                    'estimated_tokens': len(chunk_content) // 4,
-                    'content_hash': hashlib.md5(chunk_content.encode()).hexdigest()[:8]
-                }
-                parent_chunks.append(chunk)
+        
+        for i, chunk_content in enumerate(chunks, 1):
+            parent_chunks.append(self._make_chunk(
+                chunk_content,
+                chunk_id=f"{section_name}_P{i}",
+                level=_PARENT,
+                section_name=section_name,
+                chunk_index=i
+            ))
         
         return parent_chunks
 
-    def _create_child_chunks(self, section_name: str, parent_chunk: Dict, parent_idx: int) -> List[Dict]:
+    def _create_child_chunks(self, section_name: str, parent_chunk: Chunk, parent_idx: int) -> List[Chunk]:
         """Create child chunks optimized for retrieval"""
         child_chunks = []
         chunk_size = self.config['child_chunk_size']
         overlap = self.config['overlap_size']
-        content = parent_chunk['content']
+        content = parent_chunk.content
         
         if len(content) <= chunk_size:
             # Parent content fits in a single child chunk
-            chunk = {
-                'chunk_id': f"{section_name}_P{parent_idx+1}_C1",
-                'level': 'child',
-                'section_name': section_name,
-                'parent_id': parent_chunk['chunk_id'],
-                'chunk_index': 1,
-                'content': content,
-                'char_count': len(content),
-                'estimated_tokens': len(content) // 4,
-                'content_hash': hashlib.md5(content.encode()).hexdigest()[:8]
-            }
-            child_chunks.append(chunk)
+            chunks = [content]
         else:
             # Split parent content into multiple child chunks
             chunks = self._smart_split_content(content, chunk_size, overlap)
-            for i, chunk_content in enumerate(chunks, 1):
-                chunk = {
-                    'chunk_id': f"{section_name}_P{parent_idx+1}_C{i}",
-                    'level': 'child',
-                    'section_name': section_name,
-                    'parent_id': parent_chunk['chunk_id'],
-                    'chunk_index': i,
-                    'content': chunk_content,
-                    'char_count': len(chunk_content),
-                    'estimated_tokens': len(chunk_content) // 4,
-                    'content_hash': hashlib.md5(content.encode()).hexdigest()[:8]
-                }
-                child_chunks.append(chunk)
+        
+        for i, chunk_content in enumerate(chunks, 1):
+            child_chunks.append(self._make_chunk(
+                chunk_content,
+                chunk_id=f"{section_name}_P{parent_idx+1}_C{i}",
+                level=_CHILD,
+                section_name=section_name,
+                parent_id=parent_chunk.chunk_id,
+                chunk_index=i
+            ))
         
         return child_chunks
 
     def _smart_split_content(self, content: str, target_size: int, overlap: int) -> List[str]:
         """Intelligently split content while respecting natural boundaries"""
+        # Continuous text (e.g. logs) has no boundaries to respect - use plain windows
+        if '\n\n' not in content and not any(p in content for p in '.!?'):
+            return self._split_plain_text(content, target_size, overlap)
+        
         chunks = []
         
         # Start by splitting on paragraphs (most natural boundary)
         paragraphs = content.split('\n\n')
-        current_chunk = ""
+        # Accumulate fragments and join only when a chunk is emitted
+        current_parts = []
+        current_len = 0
         
         for para in paragraphs:
+            para_len = len(para)
             # Try adding the whole paragraph
-            test_chunk = current_chunk + '\n\n' + para if current_chunk else para
+            if current_len:
+                fits = current_len + 2 + para_len <= target_size
+            else:
+                fits = para_len <= target_size
             
-            if len(test_chunk) <= target_size:
-                current_chunk = test_chunk
+            if fits:
+                if current_len:
+                    current_parts.append('\n\n')
+                    current_len += 2
+                current_parts.append(para)
+                current_len += para_len
             else:
                 # Save current chunk if we have one
-                if current_chunk:
+                if current_len:
+                    current_chunk = ''.join(current_parts)
                     chunks.append(current_chunk.strip())
                     # Create overlap for context continuity
-                    if overlap > 0 and len(current_chunk) > overlap:
+                    if overlap > 0 and current_len > overlap:
                         overlap_text = current_chunk[-overlap:]
                         # Find a good sentence boundary for clean overlap
-                        sentences = re.split(r'(?<=[.!?])\s+', overlap_text)
-                        current_chunk = sentences[-1] if sentences else overlap_text
+                        overlap_text = overlap_text[_last_sentence_start(overlap_text):]
+                        current_parts = [overlap_text]
+                        current_len = len(overlap_text)
                     else:
-                        current_chunk = ""
+                        current_parts = []
+                        current_len = 0
                 
                 # Handle paragraphs that are too long
-                if len(para) > target_size:
+                if para_len > target_size:
                     # Split by sentences
-                    sentences = re.split(r'(?<=[.!?])\s+', para)
-                    temp_chunk = current_chunk
-                    
-                    for sentence in sentences:
-                        if len(temp_chunk + ' ' + sentence) <= target_size:
-                            temp_chunk = temp_chunk + ' ' + sentence if temp_chunk else sentence
+                    for sentence in _iter_sentences(para):
+                        sentence_len = len(sentence)
+                        if current_len + 1 + sentence_len <= target_size:
+                            if current_len:
+                                current_parts.append(' ')
+                                current_len += 1
+                            current_parts.append(sentence)
+                            current_len += sentence_len
                         else:
-                            if temp_chunk:
+                            if current_len:
+                                temp_chunk = ''.join(current_parts)
                                 chunks.append(temp_chunk.strip())
                                 # Handle overlap
                                 if overlap > 0:
-                                    overlap_part = temp_chunk[-overlap:] if len(temp_chunk) > overlap else temp_chunk
-                                    temp_chunk = overlap_part + ' ' + sentence
+                                    overlap_part = temp_chunk[-overlap:] if current_len > overlap else temp_chunk
+                                    current_parts = [overlap_part, ' ', sentence]
+                                    current_len = len(overlap_part) + 1 + sentence_len
                                 else:
-                                    temp_chunk = sentence
+                                    current_parts = [sentence]
+                                    current_len = sentence_len
                             else:
                                 # Even single sentence is too long - just add it
                                 chunks.append(sentence.strip())
-                                temp_chunk = ""
-                    
-                    current_chunk = temp_chunk
+                                current_parts = []
+                                current_len = 0
                 else:
-                    current_chunk = para
+                    current_parts = [para]
+                    current_len = para_len
         
         # Don't forget the last chunk
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_len:
+            chunks.append(''.join(current_parts).strip())
         
-        return [chunk for chunk in chunks if chunk.strip()]
+        # Chunks are already stripped, so only empty ones need dropping
+        return [chunk for chunk in chunks if chunk]
+
+    def _split_plain_text(self, content: str, target_size: int, overlap: int) -> List[str]:
+        """Split text without paragraph or sentence breaks into overlapping windows ending at spaces"""
+        chunks = []
+        start = 0
+        content_len = len(content)
+        
+        while start < content_len:
+            end = start + target_size
+            if end < content_len:
+                # Prefer to cut at a space in the second half of the window
+                space = content.rfind(' ', start + target_size // 2, end)
+                if space != -1:
+                    end = space
+            
+            chunk = content[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= content_len:
+                break
+            # Always advance at least half a window, even if overlap >= target_size
+            start = max(end - overlap, start + max(1, target_size // 2))
+        
+        return chunks
 
     def _calculate_optimization_metrics(self):
         """Calculate and display chunking optimization metrics"""
-        parent_chunks = [c for c in self.all_chunks if c['level'] == 'parent']
-        child_chunks = [c for c in self.all_chunks if c['level'] == 'child']
-        
-        # Calculate token statistics
-        parent_tokens = [c['estimated_tokens'] for c in parent_chunks]
-        child_tokens = [c['estimated_tokens'] for c in child_chunks]
+        parent_chunks = self._parent_chunks
+        child_chunks = self._child_chunks
         
         # Analyze context window utilization
-        avg_child_tokens = sum(child_tokens) / len(child_tokens) if child_tokens else 0
+        avg_child_tokens = self._avg_child_tokens
         max_chunks_per_query = self.config['available_context'] // (avg_child_tokens * 4)
         
         print(f"\n📊 Chunking Optimization Metrics:")
-        print(f"   📦 Parent chunks: {len(parent_chunks)} (avg {sum(parent_tokens)/len(parent_tokens):.0f} tokens)")
+        print(f"   📦 Parent chunks: {len(parent_chunks)} (avg {self._avg_parent_tokens:.0f} tokens)")
         print(f"   📄 Child chunks: {len(child_chunks)} (avg {avg_child_tokens:.0f} tokens)")
         print(f"   🎯 Optimal chunks per query: {max_chunks_per_query:.0f}")
         print(f"   📈 Context Window Usage: {(max_chunks_per_query * avg_child_tokens * 4 / self.model_context_window):.1%}")
@@ -381,15 +623,10 @@ class SmartRAGChunker:
             print("❌ No chunks to save!")
             return {}
         
-        # Create output folder in the same directory as the source files
-        if self.source_folder:
-            output_folder = os.path.join(self.source_folder, 'output')
-        else:
-            output_folder = os.path.join(os.getcwd(), 'output')
+        output_folder = self._get_output_folder()
         
-        # Ensure output folder exists
-        os.makedirs(output_folder, exist_ok=True)
-        print(f"📁 Created output folder: {output_folder}")
+        # Content hashes are only needed in the saved files, so compute them lazily
+        self._ensure_content_hashes(self.all_chunks)
         
         files_created = {}
         
@@ -419,42 +656,107 @@ class SmartRAGChunker:
         
         return files_created
 
+    def stream_chunked_output(self, base_filename: str = "rag_chunks") -> Dict[str, str]:
+        """Chunk and save the text formats section by section, without keeping all chunks in memory
+
+        Peak memory is one section when chunking in-process, and about `max_workers`
+        sections when the parallel path is used.
+        """
+        
+        if not self.sections:
+            print("❌ No sections to chunk!")
+            return {}
+        
+        output_folder = self._get_output_folder()
+        files_created = {
+            'hierarchical': os.path.join(output_folder, f"{base_filename}_hierarchical.txt"),
+            'rag': os.path.join(output_folder, f"{base_filename}_rag_ready.txt"),
+        }
+        
+        # JSON and metadata need the whole corpus, so only the text formats are streamed
+        with open(files_created['hierarchical'], 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as hierarchical_f, \
+                open(files_created['rag'], 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as rag_f:
+            hierarchical_f.write(self._hierarchical_header())
+            rag_f.write(_RAG_HEADER)
+            
+            for section_data in self.iter_section_chunks():
+                chunks = section_data['parent_chunks'] + section_data['child_chunks']
+                self._ensure_content_hashes(chunks)
+                hierarchical_f.writelines(self._hierarchical_section_lines(section_data))
+                rag_f.writelines(self._rag_lines(chunks))
+                print(f"  ✅ Saved '{section_data['section_name']}': {len(chunks)} chunks")
+        
+        print(f"\n💾 Streamed {len(files_created)} output files in the 'output' folder:")
+        for purpose, filename in files_created.items():
+            print(f"   📄 {purpose}: {os.path.basename(filename)}")
+        
+        return files_created
+
+    def _get_output_folder(self) -> str:
+        """Create (if needed) and return the output folder next to the source files"""
+        if self.source_folder:
+            output_folder = os.path.join(self.source_folder, 'output')
+        else:
+            output_folder = os.path.join(os.getcwd(), 'output')
+        
+        # Ensure output folder exists
+        os.makedirs(output_folder, exist_ok=True)
+        print(f"📁 Created output folder: {output_folder}")
+        return output_folder
+
+    def _ensure_content_hashes(self, chunks: Iterable[Chunk]):
+        """Add content hashes to chunks that do not have one yet"""
+        for chunk in chunks:
+            if not chunk.content_hash:
+                chunk.content_hash = _hash(chunk.content.encode('utf-8'))
+
     def _save_hierarchical_format(self, filename: str):
         """Save human-readable hierarchical format"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("SMART RAG HIERARCHICAL CHUNKS\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Model Context Window: {self.model_context_window} tokens\n")
-            f.write(f"Target Context Usage: {self.config['target_context_usage']:.0%}\n")
-            f.write(f"Structure: Section → Parent Chunks → Child Chunks\n")
-            f.write("=" * 80 + "\n\n")
+        with open(filename, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+            f.write(self._hierarchical_header())
+            for section_data in self.hierarchical_chunks.values():
+                f.writelines(self._hierarchical_section_lines(section_data))
+
+    def _hierarchical_header(self) -> str:
+        """Header block of the hierarchical format"""
+        return (
+            "SMART RAG HIERARCHICAL CHUNKS\n"
+            + "=" * 80 + "\n"
+            + f"Model Context Window: {self.model_context_window} tokens\n"
+            + f"Target Context Usage: {self.config['target_context_usage']:.0%}\n"
+            + f"Structure: Section → Parent Chunks → Child Chunks\n"
+            + "=" * 80 + "\n\n"
+        )
+
+    def _hierarchical_section_lines(self, section_data: Dict) -> Iterator[str]:
+        """Yield the hierarchical format lines for one section"""
+        yield f"{'#' * 80}\n"
+        yield f"# SECTION: {section_data['section_name'].upper()}\n"
+        yield f"# Original: {section_data['original_length']:,} chars\n"
+        yield f"# Parents: {len(section_data['parent_chunks'])}, Children: {len(section_data['child_chunks'])}\n"
+        yield f"{'#' * 80}\n\n"
+        
+        child_by_id = {c.chunk_id: c for c in section_data['child_chunks']}
+        
+        # Write parent chunks
+        for parent in section_data['parent_chunks']:
+            yield f"📦 PARENT CHUNK: {parent.chunk_id}\n"
+            yield f"   Tokens: ~{parent.estimated_tokens}, Children: {parent.child_count}\n"
+            yield f"   Hash: {parent.content_hash}\n"
+            yield f"   {'-' * 60}\n"
+            yield f"   {parent.content[:200]}...\n"
+            yield f"   {'-' * 60}\n\n"
             
-            for section_name, section_data in self.hierarchical_chunks.items():
-                f.write(f"{'#' * 80}\n")
-                f.write(f"# SECTION: {section_name.upper()}\n")
-                f.write(f"# Original: {section_data['original_length']:,} chars\n")
-                f.write(f"# Parents: {len(section_data['parent_chunks'])}, Children: {len(section_data['child_chunks'])}\n")
-                f.write(f"{'#' * 80}\n\n")
-                
-                # Write parent chunks
-                for parent in section_data['parent_chunks']:
-                    f.write(f"📦 PARENT CHUNK: {parent['chunk_id']}\n")
-                    f.write(f"   Tokens: ~{parent['estimated_tokens']}, Children: {parent['child_count']}\n")
-                    f.write(f"   Hash: {parent['content_hash']}\n")
-                    f.write(f"   {'-' * 60}\n")
-                    f.write(f"   {parent['content'][:200]}...\n")
-                    f.write(f"   {'-' * 60}\n\n")
-                    
-                    # Write corresponding child chunks
-                    child_chunks = [c for c in section_data['child_chunks'] if c['parent_id'] == parent['chunk_id']]
-                    for child in child_chunks:
-                        f.write(f"   📄 CHILD: {child['chunk_id']}\n")
-                        f.write(f"      Tokens: ~{child['estimated_tokens']}, Hash: {child['content_hash']}\n")
-                        f.write(f"      {'-' * 40}\n")
-                        f.write(f"      {child['content']}\n")
-                        f.write(f"      {'-' * 40}\n\n")
-                
-                f.write(f"{'=' * 80}\n\n")
+            # Write corresponding child chunks
+            for child_id in parent.child_chunk_ids:
+                child = child_by_id[child_id]
+                yield f"   📄 CHILD: {child.chunk_id}\n"
+                yield f"      Tokens: ~{child.estimated_tokens}, Hash: {child.content_hash}\n"
+                yield f"      {'-' * 40}\n"
+                yield f"      {child.content}\n"
+                yield f"      {'-' * 40}\n\n"
+        
+        yield f"{'=' * 80}\n\n"
 
     def _save_json_format(self, filename: str):
         """Save structured JSON format for programmatic use"""
@@ -470,37 +772,40 @@ class SmartRAGChunker:
                 'total_sections': len(self.hierarchical_chunks),
                 'total_chunks': len(self.all_chunks)
             },
-            'sections': self.hierarchical_chunks
+            'sections': {
+                section_name: {
+                    **section_data,
+                    'parent_chunks': [c.to_dict() for c in section_data['parent_chunks']],
+                    'child_chunks': [c.to_dict() for c in section_data['child_chunks']]
+                }
+                for section_name, section_data in self.hierarchical_chunks.items()
+            }
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_json(filename, data)
 
     def _save_rag_format(self, filename: str):
         """Save RAG-ready format for embedding and vector databases"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("# SMART RAG-READY CHUNKS\n")
-            f.write("# Format: ID|LEVEL|SECTION|PARENT|TOKENS|HASH|CONTENT\n\n")
-        
-            for chunk in self.all_chunks:
-                parent_id = chunk.get('parent_id', 'ROOT')
-                # Clean content for safe storage
-                safe_content = (
-                    chunk['content']
-                    .replace('|', '&#124;')
-                    .replace('\n', '\\n')
-                )
-                line = (
-                    f"{chunk['chunk_id']}|{chunk['level']}|{chunk['section_name']}|"
-                    f"{parent_id}|{chunk['estimated_tokens']}|{chunk['content_hash']}|"
-                    f"{safe_content}\n"
-                )
-                f.write(line)
+        with open(filename, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+            f.write(_RAG_HEADER)
+            f.writelines(self._rag_lines(self.all_chunks))
+
+    def _rag_lines(self, chunks: Iterable[Chunk]) -> Iterator[str]:
+        """Yield one RAG-ready line per chunk"""
+        for chunk in chunks:
+            parent_id = chunk.parent_id or 'ROOT'
+            # Clean content for safe storage
+            safe_content = chunk.content.translate(_RAG_TRANS)
+            yield (
+                f"{chunk.chunk_id}|{chunk.level}|{chunk.section_name}|"
+                f"{parent_id}|{chunk.estimated_tokens}|{chunk.content_hash}|"
+                f"{safe_content}\n"
+            )
 
     def _save_metadata(self, filename: str):
         """Save metadata and statistics"""
-        parent_chunks = [c for c in self.all_chunks if c['level'] == 'parent']
-        child_chunks = [c for c in self.all_chunks if c['level'] == 'child']
+        parent_chunks = self._parent_chunks
+        child_chunks = self._child_chunks
         
         metadata = {
             'chunking_config': {
@@ -513,8 +818,8 @@ class SmartRAGChunker:
                 'parent_chunks': len(parent_chunks),
                 'child_chunks': len(child_chunks),
                 'total_chunks': len(self.all_chunks),
-                'avg_parent_tokens': sum(c['estimated_tokens'] for c in parent_chunks) / len(parent_chunks),
-                'avg_child_tokens': sum(c['estimated_tokens'] for c in child_chunks) / len(child_chunks) if child_chunks else 0
+                'avg_parent_tokens': self._avg_parent_tokens,
+                'avg_child_tokens': self._avg_child_tokens
             },
             'section_breakdown': {
                 section: {
@@ -527,13 +832,12 @@ class SmartRAGChunker:
             'recommendations': self._get_optimization_recommendations()
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2)
+        _write_json(filename, metadata)
 
     def _get_optimization_recommendations(self) -> Dict[str, str]:
         """Generate helpful optimization recommendations"""
-        child_chunks = [c for c in self.all_chunks if c['level'] == 'child']
-        avg_child_tokens = sum(c['estimated_tokens'] for c in child_chunks) / len(child_chunks) if child_chunks else 0
+        child_chunks = self._child_chunks
+        avg_child_tokens = self._avg_child_tokens
         
         recommendations = {}
         